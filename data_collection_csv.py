@@ -6,6 +6,479 @@ from pathlib import Path
 import threading
 import argparse
 import sys
+import csv
+import io
+import json
+import codecs
+import hashlib
+import heapq
+import tempfile
+import glob
+import shutil
+import random
+import re
+import zlib
+from collections import deque, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+
+# Aggregate functions supported by CSVProcessor.aggregate
+AGGREGATE_FUNCTIONS = ('count', 'sum', 'mean', 'min', 'max')
+
+
+def _read_record(handle):
+    """Read one raw CSV record (it may span several lines) from a binary file handle"""
+    record = handle.readline()
+    # An odd number of quotes means a quoted field continues on the next line
+    while record and record.count(b'"') % 2:
+        line = handle.readline()
+        if not line:
+            break
+        record += line
+    return record
+
+
+def _split_record(raw):
+    """Parse a raw CSV record into a list of field values"""
+    return next(csv.reader(io.StringIO(raw.decode('utf-8'))), [])
+
+
+def _write_rows(output_path, columns, rows):
+    """
+    Write a header and an iterable of rows to a CSV file
+    
+    Returns:
+        int: Number of data rows written
+    """
+    count = 0
+    with open(output_path, 'w', newline='', encoding='utf-8') as handle:
+        writer = csv.writer(handle, lineterminator='\n')
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def _distinct_rows(rows, count=False, memory_mb=512, temp_dir=None, stats=None):
+    """
+    Remove duplicate rows from a stream, keeping first-occurrence order
+    
+    Rows are tracked by a 16-byte digest. When the estimated memory use exceeds
+    ``memory_mb``, the seen digests and all remaining rows are spilled to hash
+    partitions on disk, each partition is deduplicated on its own (and split again
+    if it does not fit in the budget) and the results are merged back in
+    first-occurrence order.
+    
+    Args:
+        rows (iterable): Rows as lists of strings
+        count (bool): Append the number of occurrences to each row. Rows are then
+            only yielded once the whole input has been read.
+        memory_mb (int): Memory budget for the in-memory hash set
+        temp_dir (str, optional): Directory for spill partitions
+        stats (dict, optional): Updated with ``input_rows`` and ``spilled``
+    
+    Yields:
+        list: Distinct rows (with the occurrence count appended if ``count``)
+    """
+    stats = {} if stats is None else stats
+    stats.update(input_rows=0, spilled=False)
+    memory_limit = memory_mb * 1024 * 1024
+    memory_used = 0
+    # Without counts only the digests are needed: a plain set of 16-byte digests.
+    # With counts: digest -> [first row number, occurrences, row]
+    seen = {} if count else set()
+    rows = iter(rows)
+    
+    for seq, row in enumerate(rows):
+        stats['input_rows'] += 1
+        digest = hashlib.blake2b(json.dumps(row).encode('utf-8'), digest_size=16).digest()
+        if count:
+            entry = seen.get(digest)
+            if entry is not None:
+                entry[1] += 1
+                continue
+            seen[digest] = [seq, 1, row]
+            memory_used += 200 + sum(len(value) + 50 for value in row)
+        else:
+            if digest in seen:
+                continue
+            seen.add(digest)
+            memory_used += 100  # 49-byte bytes object plus its set slot
+            yield row
+        if memory_used > memory_limit:
+            stats['spilled'] = True
+            break
+    else:
+        if count:
+            for seq, occurrences, row in seen.values():
+                yield row + [str(occurrences)]
+        return
+    
+    partitions = 64
+    with tempfile.TemporaryDirectory(prefix='csv_distinct_', dir=temp_dir) as spill_dir:
+        spill_dir = Path(spill_dir)
+        
+        # Spill known digests and all remaining rows to hash partitions
+        handles = [open(spill_dir / f'part_{i}.csv', 'w', newline='', encoding='utf-8')
+                   for i in range(partitions)]
+        try:
+            writers = [csv.writer(handle, lineterminator='\n') for handle in handles]
+            if count:
+                for digest, (seq, occurrences, row) in seen.items():
+                    writers[digest[0] % partitions].writerow([digest.hex(), seq, occurrences] + row)
+            else:
+                # Row number -1 marks rows that are already written
+                for digest in seen:
+                    writers[digest[0] % partitions].writerow([digest.hex(), -1, 1])
+            seen.clear()
+            for seq, row in enumerate(rows, start=stats['input_rows']):
+                stats['input_rows'] += 1
+                digest = hashlib.blake2b(json.dumps(row).encode('utf-8'), digest_size=16).digest()
+                writers[digest[0] % partitions].writerow([digest.hex(), seq, 1] + row)
+        finally:
+            for handle in handles:
+                handle.close()
+        
+        # Deduplicate each partition and write its new rows ordered by first occurrence
+        result_paths = []
+        for i in range(partitions):
+            result_paths.append(spill_dir / f'result_{i}.csv')
+            _dedupe_partition(spill_dir / f'part_{i}.csv', result_paths[-1], memory_limit)
+        
+        # Merge partition results back into first-occurrence order
+        for record in _iter_merged_results(result_paths):
+            yield record[2:] + [record[1]] if count else record[2:]
+
+
+def _iter_merged_results(result_paths):
+    """Merge deduplicated partition results (rows starting with their row number) by row number"""
+    handles = [open(result_path, 'r', newline='', encoding='utf-8') for result_path in result_paths]
+    try:
+        yield from heapq.merge(*(csv.reader(handle) for handle in handles),
+                               key=lambda record: int(record[0]))
+    finally:
+        for handle in handles:
+            handle.close()
+
+
+def _dedupe_partition(part_path, result_path, memory_limit, depth=1):
+    """
+    Deduplicate one spilled partition into a result file ordered by first occurrence
+    
+    A partition too large for the memory budget is split again by the next byte of
+    the row digests and the results of the sub-partitions are merged, so memory
+    stays bounded however much data was spilled.
+    
+    Args:
+        part_path (Path): Spilled partition (digest, row number, occurrences, row values)
+        result_path (Path): Output file (row number, occurrences, row values)
+        memory_limit (int): Memory budget in bytes
+        depth (int): Digest byte used to split this partition further
+    """
+    partitions = 64
+    part_size = part_path.stat().st_size
+    # Parsed entries take roughly three times their size on disk; tiny partitions are never split
+    if part_size * 3 > memory_limit and part_size > 64 * 1024 and depth < 16:
+        sub_paths = [part_path.with_name(f'{part_path.stem}_{i}.csv') for i in range(partitions)]
+        used = set()
+        handles = [open(sub_path, 'w', newline='', encoding='utf-8') for sub_path in sub_paths]
+        try:
+            writers = [csv.writer(handle, lineterminator='\n') for handle in handles]
+            with open(part_path, 'r', newline='', encoding='utf-8') as handle:
+                for record in csv.reader(handle):
+                    index = int(record[0][2 * depth:2 * depth + 2], 16) % partitions
+                    used.add(index)
+                    writers[index].writerow(record)
+        finally:
+            for handle in handles:
+                handle.close()
+        
+        # A single sub-partition means one heavily repeated row; splitting cannot help
+        if len(used) > 1:
+            part_path.unlink()
+            sub_results = []
+            for sub_path in sub_paths:
+                sub_results.append(sub_path.with_name(f'{sub_path.stem}_result.csv'))
+                _dedupe_partition(sub_path, sub_results[-1], memory_limit, depth + 1)
+            with open(result_path, 'w', newline='', encoding='utf-8') as handle:
+                csv.writer(handle, lineterminator='\n').writerows(_iter_merged_results(sub_results))
+            for sub_result in sub_results:
+                sub_result.unlink()
+            return
+        
+        for sub_path in sub_paths:
+            sub_path.unlink()
+    
+    entries = {}
+    with open(part_path, 'r', newline='', encoding='utf-8') as handle:
+        for record in csv.reader(handle):
+            seq, occurrences = int(record[1]), int(record[2])
+            entry = entries.get(record[0])
+            if entry is None:
+                entries[record[0]] = [seq, occurrences, record[3:]]
+            else:
+                entry[1] += occurrences
+                if seq < entry[0]:
+                    entry[0], entry[2] = seq, record[3:]
+    part_path.unlink()
+    
+    with open(result_path, 'w', newline='', encoding='utf-8') as handle:
+        writer = csv.writer(handle, lineterminator='\n')
+        for seq, occurrences, row in sorted(entry for entry in entries.values() if entry[0] >= 0):
+            writer.writerow([seq, occurrences] + row)
+
+
+def _sort_value(value, descending=False):
+    """
+    Sort key for one field: numbers numerically, then text, then empty values
+    
+    Keys are compared in reverse when sorting in descending order (text, then
+    numbers), so empty values get the lowest rank there to stay last.
+    """
+    if value == '':
+        return (-1 if descending else 2, 0.0, '')
+    try:
+        number = float(value)
+    except ValueError:
+        return (1, 0.0, value)
+    if number != number:  # NaN does not compare, sort it as text
+        return (1, 0.0, value)
+    return (0, number, '')
+
+
+def _sort_run(rows, key_indices, descending, run_path):
+    """
+    Sort one run of rows and write it to a headerless CSV file
+    
+    Module-level so it can run in a worker process.
+    """
+    rows.sort(key=lambda row: [_sort_value(row[i], descending) for i in key_indices], reverse=descending)
+    with open(run_path, 'w', newline='', encoding='utf-8') as handle:
+        csv.writer(handle, lineterminator='\n').writerows(rows)
+
+
+def _sorted_rows(rows, key_indices, descending=False, memory_mb=512, temp_dir=None,
+                 workers=1, stats=None):
+    """
+    Sort a stream of rows with an external merge sort
+    
+    Rows are collected until the estimated memory use exceeds ``memory_mb``, then
+    sorted and written to a run file (in worker processes if ``workers`` > 1).
+    The runs are k-way merged with a heap. The sort is stable.
+    
+    Args:
+        rows (iterable): Rows as lists of strings
+        key_indices (list): Positions of the sort key columns in each row
+        descending (bool): Sort in descending order
+        memory_mb (int): Memory budget for one run
+        temp_dir (str, optional): Directory for run files
+        workers (int): Number of worker processes sorting runs
+        stats (dict, optional): Updated with the number of ``runs`` written to disk
+    
+    Yields:
+        list: Rows in sorted order
+    """
+    stats = {} if stats is None else stats
+    stats['runs'] = 0
+    memory_limit = memory_mb * 1024 * 1024
+    
+    def sort_key(row):
+        return [_sort_value(row[i], descending) for i in key_indices]
+    
+    with tempfile.TemporaryDirectory(prefix='csv_sort_', dir=temp_dir) as run_dir:
+        run_paths = []
+        pending = []
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            buffer = []
+            memory_used = 0
+            for row in rows:
+                buffer.append(row)
+                memory_used += 100 + sum(len(value) + 50 for value in row)
+                if memory_used <= memory_limit:
+                    continue
+                
+                run_paths.append(Path(run_dir) / f'run_{len(run_paths)}.csv')
+                if executor is None:
+                    _sort_run(buffer, key_indices, descending, run_paths[-1])
+                else:
+                    # Bound the number of runs held in memory by the workers
+                    if len(pending) >= workers:
+                        pending.pop(0).result()
+                    pending.append(executor.submit(_sort_run, buffer, key_indices, descending, run_paths[-1]))
+                buffer = []
+                memory_used = 0
+            
+            for future in pending:
+                future.result()
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        
+        buffer.sort(key=sort_key, reverse=descending)
+        stats['runs'] = len(run_paths)
+        if not run_paths:
+            yield from buffer
+            return
+        
+        # Merge consecutive groups of runs until few enough remain to open at once
+        merge_width = 64
+        merge_pass = 0
+        while len(run_paths) > merge_width:
+            merge_pass += 1
+            merged_paths = []
+            for start in range(0, len(run_paths), merge_width):
+                group = run_paths[start:start + merge_width]
+                merged_paths.append(Path(run_dir) / f'merge_{merge_pass}_{len(merged_paths)}.csv')
+                handles = [open(run_path, 'r', newline='', encoding='utf-8') for run_path in group]
+                try:
+                    with open(merged_paths[-1], 'w', newline='', encoding='utf-8') as output_handle:
+                        csv.writer(output_handle, lineterminator='\n').writerows(
+                            heapq.merge(*(csv.reader(handle) for handle in handles),
+                                        key=sort_key, reverse=descending))
+                finally:
+                    for handle in handles:
+                        handle.close()
+                for run_path in group:
+                    run_path.unlink()
+            run_paths = merged_paths
+        
+        # Merge runs from disk together with the last, in-memory run
+        handles = [open(run_path, 'r', newline='', encoding='utf-8') for run_path in run_paths]
+        try:
+            yield from heapq.merge(*(csv.reader(handle) for handle in handles), buffer,
+                                   key=sort_key, reverse=descending)
+        finally:
+            for handle in handles:
+                handle.close()
+
+
+def _iter_record_blocks(handle, block_bytes):
+    """
+    Yield blocks of whole CSV records from a binary handle positioned at a record start
+    
+    A newline ends a record only if it is preceded by an even number of quotes
+    in the block, so quoted fields with line breaks are never split.
+    """
+    carry = b''
+    while True:
+        data = handle.read(block_bytes)
+        if not data:
+            if carry:
+                yield carry
+            return
+        block = carry + data
+        end = block.rfind(b'\n')
+        while end != -1 and block.count(b'"', 0, end) % 2:
+            end = block.rfind(b'\n', 0, end)
+        if end == -1:
+            carry = block
+            continue
+        yield block[:end + 1]
+        carry = block[end + 1:]
+
+
+def _aggregate_block(header_raw, block, group_by, value_columns):
+    """
+    Compute partial aggregates (row count, and count/sum/min/max per value column) for a block
+    
+    Module-level so it can run in a worker process.
+    
+    Returns:
+        pandas.DataFrame: Partial aggregates indexed by the group keys
+    """
+    # Only truly empty fields are missing, so keys like "NA" or "None" keep their own groups
+    df = pd.read_csv(io.BytesIO(header_raw + block), usecols=group_by + value_columns,
+                     dtype={col: str for col in group_by}, keep_default_na=False, na_values=[''])
+    keys = [df[col] for col in group_by]
+    
+    partial = df.groupby(keys, dropna=False, sort=False).size().to_frame('count')
+    for col in value_columns:
+        values = pd.to_numeric(df[col], errors='coerce')
+        stats = values.groupby(keys, dropna=False, sort=False).agg(['count', 'sum', 'min', 'max'])
+        partial = partial.join(stats.add_prefix(f'{col}__'))
+    return partial
+
+
+def _combine_partials(partials, value_columns):
+    """Combine partial aggregates of the same groups into one set of partial aggregates"""
+    combine = {'count': 'sum'}
+    for col in value_columns:
+        combine.update({f'{col}__count': 'sum', f'{col}__sum': 'sum',
+                        f'{col}__min': 'min', f'{col}__max': 'max'})
+    
+    combined = pd.concat(partials)
+    levels = list(range(combined.index.nlevels))
+    return combined.groupby(level=levels, dropna=False, sort=False).agg(combine)
+
+
+def _write_json_atomic(path, data):
+    """Write a small JSON state file so that readers never see a partial write"""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as handle:
+        json.dump(data, handle, indent=2)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
+
+
+class _ShardWriter:
+    """
+    Write CSV rows to many shard files while keeping only a bounded number open
+    
+    Handles are buffered and closed in least-recently-used order; a closed shard is
+    reopened in append mode when it receives more rows.
+    """
+    
+    def __init__(self, output_dir, columns, max_open_files=64):
+        self.output_dir = Path(output_dir)
+        self.max_open_files = max(1, max_open_files)
+        self.handles = OrderedDict()
+        self.shards = {}  # shard name -> {'path', 'rows', 'bytes', ...}
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer, lineterminator='\n')
+        self.header = self.encode(columns)
+    
+    def encode(self, row):
+        """Encode a row as CSV bytes"""
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        self.writer.writerow(row)
+        return self.buffer.getvalue().encode('utf-8')
+    
+    def _handle(self, name):
+        handle = self.handles.get(name)
+        if handle is not None:
+            self.handles.move_to_end(name)
+            return handle
+        
+        if len(self.handles) >= self.max_open_files:
+            _, oldest = self.handles.popitem(last=False)
+            oldest.close()
+        
+        path = self.output_dir / name
+        if name in self.shards:
+            handle = open(path, 'ab', buffering=1024 * 1024)
+        else:
+            handle = open(path, 'wb', buffering=1024 * 1024)
+            handle.write(self.header)
+            self.shards[name] = {'path': name, 'rows': 0, 'bytes': len(self.header)}
+        self.handles[name] = handle
+        return handle
+    
+    def write(self, name, data):
+        """Append an encoded row to a shard, creating the shard if needed"""
+        self._handle(name).write(data)
+        self.shards[name]['rows'] += 1
+        self.shards[name]['bytes'] += len(data)
+    
+    def close(self):
+        """Close all open shard files"""
+        for handle in self.handles.values():
+            handle.close()
+        self.handles.clear()
 
 
 class CSVColumnSelector:
@@ -15,9 +488,21 @@ class CSVColumnSelector:
         self.root.geometry("800x600")
         
         self.df = None
+        self.preview_df = None
+        self.preview_rows = []
+        self.preview_widths = []
+        self.preview_generation = 0
         self.csv_file_path = None
         self.selected_columns = []
         
+        # Preview sampling options shown in the GUI. Random rows of large files
+        # use offset sampling, which seeks into the file instead of reading all of it.
+        self.sample_methods = {
+            "First rows": 'head',
+            "Random rows": 'random',
+            "Last rows": 'tail'
+        }
+        
         self.setup_gui()
     
     def setup_gui(self):
@@ -36,9 +521,18 @@ class CSVColumnSelector:
             # Set minimum window size
             self.root.minsize(1000, 700)
             
-            # File selection button
-            ttk.Button(main_frame, text="Select CSV File", 
-                      command=self.select_csv_file).grid(row=0, column=0, columnspan=2, pady=(0, 10))
+            # File selection button and preview sampling method
+            file_frame = ttk.Frame(main_frame)
+            file_frame.grid(row=0, column=0, columnspan=2, pady=(0, 10))
+            
+            ttk.Button(file_frame, text="Select CSV File", 
+                      command=self.select_csv_file).pack(side=tk.LEFT, padx=(0, 20))
+            ttk.Label(file_frame, text="Preview:").pack(side=tk.LEFT, padx=(0, 5))
+            self.sample_method_var = tk.StringVar(value="First rows")
+            sample_combobox = ttk.Combobox(file_frame, textvariable=self.sample_method_var,
+                                           values=list(self.sample_methods), state="readonly", width=20)
+            sample_combobox.pack(side=tk.LEFT)
+            sample_combobox.bind("<<ComboboxSelected>>", self.change_preview_sampling)
             
             # File information label
             self.file_info_label = ttk.Label(main_frame, text="No file selected")
@@ -87,8 +581,8 @@ class CSVColumnSelector:
                       command=self.deselect_all_checkboxes).pack(side=tk.LEFT)
             
             # Data preview section
-            preview_label = ttk.Label(content_frame, text="Data Preview (first 1000 rows):", font=('TkDefaultFont', 10, 'bold'))
-            preview_label.grid(row=0, column=1, sticky=tk.W)
+            self.preview_label = ttk.Label(content_frame, text="Data Preview (first 1000 rows):", font=('TkDefaultFont', 10, 'bold'))
+            self.preview_label.grid(row=0, column=1, sticky=tk.W)
             
             # Preview frame
             preview_frame = ttk.LabelFrame(content_frame, text="CSV Preview", padding="5")
@@ -143,7 +637,8 @@ class CSVColumnSelector:
             self.file_info_label.config(text="Loading file...")
             
             # Start loading in separate thread
-            thread = threading.Thread(target=self._load_csv_thread)
+            method = self.sample_methods[self.sample_method_var.get()]
+            thread = threading.Thread(target=self._load_csv_thread, args=(method,))
             thread.daemon = True
             thread.start()
             
@@ -151,7 +646,7 @@ class CSVColumnSelector:
             self.progress.stop()
             messagebox.showerror("Error", f"Error starting file loading: {str(e)}")
     
-    def _load_csv_thread(self):
+    def _load_csv_thread(self, method):
         """Load CSV in separate thread"""
         try:
             # Check file size
@@ -160,18 +655,22 @@ class CSVColumnSelector:
             
             # Use chunks for large files
             if file_size_mb > 100:  # If file larger than 100MB
-                # Load only first 1000 rows for preview
-                self.df = pd.read_csv(self.csv_file_path, nrows=1000)
+                # Load only a 1000 row sample for preview
+                processor = CSVProcessor(self.csv_file_path)
+                self.df = processor.sample(1000, 'offset' if method == 'random' else method)
                 self.is_sample = True
-                # Check total number of rows without loading entire file
-                total_rows = sum(1 for line in open(self.csv_file_path, 'r', encoding='utf-8')) - 1  # -1 for header
-                info_text = f"File: {Path(self.csv_file_path).name} ({file_size_mb:.1f}MB)\nTotal rows: {total_rows:,}\nLoaded sample: 1,000 rows"
+                # Estimate total number of rows without reading entire file
+                total_rows = processor.estimate_rows()
+                info_text = f"File: {Path(self.csv_file_path).name} ({file_size_mb:.1f}MB)\nEstimated rows: ~{total_rows:,}\nLoaded sample: {len(self.df):,} rows"
             else:
                 # Load entire file
                 self.df = pd.read_csv(self.csv_file_path)
                 self.is_sample = False
                 info_text = f"File: {Path(self.csv_file_path).name} ({file_size_mb:.1f}MB)\nRows: {len(self.df):,}\nColumns: {len(self.df.columns)}"
             
+            self.preview_df = self._build_preview_sample(method)
+            self._prepare_preview()
+            
             # Update GUI in main thread
             self.root.after(0, self._update_gui_after_load, info_text)
             
@@ -185,15 +684,56 @@ class CSVColumnSelector:
             self.root.after(0, lambda: messagebox.showerror("Error", f"Error loading file: {str(e)}"))
             self.root.after(0, self.progress.stop)
     
+    def _build_preview_sample(self, method):
+        """Select the preview rows according to the chosen sampling method"""
+        if self.is_sample:
+            # Large files are already sampled with the chosen method
+            return self.df
+        if method == 'head':
+            return self.df.head(1000)
+        if method == 'tail':
+            return self.df.tail(1000)
+        return self.df.sample(n=min(1000, len(self.df))).sort_index()
+    
+    def change_preview_sampling(self, event=None):
+        """Resample the preview in a separate thread when the sampling method changes"""
+        try:
+            if self.df is None:
+                return
+            
+            self.progress.start()
+            method = self.sample_methods[self.sample_method_var.get()]
+            thread = threading.Thread(target=self._sample_preview_thread, args=(method,))
+            thread.daemon = True
+            thread.start()
+            
+        except Exception as e:
+            self.progress.stop()
+            messagebox.showerror("Error", f"Error starting sampling: {str(e)}")
+    
+    def _sample_preview_thread(self, method):
+        """Resample preview rows in separate thread"""
+        try:
+            if self.is_sample:
+                processor = CSVProcessor(self.csv_file_path)
+                self.df = processor.sample(1000, 'offset' if method == 'random' else method)
+            
+            self.preview_df = self._build_preview_sample(method)
+            self._prepare_preview()
+            self.root.after(0, self._update_preview)
+            self.root.after(0, self.progress.stop)
+            
+        except Exception as e:
+            message = f"Error sampling file: {str(e)}"
+            self.root.after(0, lambda: messagebox.showerror("Error", message))
+            self.root.after(0, self.progress.stop)
+    
     def _update_gui_after_load(self, info_text):
         """Update GUI after loading file"""
         try:
             self.progress.stop()
             self.file_info_label.config(text=info_text)
             
-            # Clear previous data
-            self.tree.delete(*self.tree.get_children())
-            
             # Clear checkboxes if they exist
             for widget in self.checkbox_scrollable_frame.winfo_children():
                 widget.destroy()
@@ -217,34 +757,66 @@ class CSVColumnSelector:
                 checkbox.grid(row=i, column=0, sticky=tk.W, padx=5, pady=2)
                 self.column_checkboxes[col] = checkbox
             
+            self._update_preview()
+            
+            self.save_button.config(state=tk.NORMAL)
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error updating interface: {str(e)}")
+    
+    def _prepare_preview(self):
+        """Format preview rows and column widths in one pass (runs in worker thread)"""
+        formatted = self.preview_df.astype(object).where(self.preview_df.notna(), "")
+        columns = [list(map(str, values)) for values in formatted.to_numpy().T.tolist()]
+        self.preview_rows = list(zip(*columns))
+        
+        # Set column width based on name length and content of the first 10 rows
+        self.preview_widths = []
+        for col, values in zip(formatted.columns, columns):
+            col_width = max(len(col) * 8, 80)  # Minimum 80px, 8px per character
+            if values:
+                max_data_width = max(max(map(len, values[:10])), len(col)) * 8
+                col_width = min(max_data_width, 200)  # Maximum 200px
+            self.preview_widths.append(col_width)
+    
+    def _update_preview(self):
+        """Fill the preview treeview with the prepared rows"""
+        try:
+            # Stop any batches still inserting an older preview
+            self.preview_generation += 1
+            
+            self.tree.delete(*self.tree.get_children())
+            self.preview_label.config(
+                text=f"Data Preview ({self.sample_method_var.get().lower()}, {len(self.preview_rows):,} rows):")
+            
             # Configure treeview
             self.tree["columns"] = list(self.df.columns)
             self.tree["show"] = "headings"
             
-            # Configure headers with automatic width
-            for col in self.df.columns:
+            # Configure headers with precomputed width
+            for col, col_width in zip(self.df.columns, self.preview_widths):
                 self.tree.heading(col, text=col)
-                # Set column width based on name length and content
-                col_width = max(len(col) * 8, 80)  # Minimum 80px, 8px per character
-                
-                # Check width of sample data
-                if len(self.df) > 0:
-                    sample_data = self.df[col].head(10).astype(str)
-                    max_data_width = max([len(str(val)) for val in sample_data] + [len(col)]) * 8
-                    col_width = min(max_data_width, 200)  # Maximum 200px
-                
                 self.tree.column(col, width=col_width, minwidth=80)
             
-            # Add first 1000 rows to preview
-            preview_data = self.df.head(1000)
-            for index, row in preview_data.iterrows():
-                values = [str(val) if pd.notna(val) else "" for val in row]
+            self._insert_preview_rows(self.preview_generation, 0)
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error updating preview: {str(e)}")
+    
+    def _insert_preview_rows(self, generation, start, batch_size=200):
+        """Insert prepared rows in batches so the interface stays responsive"""
+        try:
+            if generation != self.preview_generation:
+                return
+            
+            for values in self.preview_rows[start:start + batch_size]:
                 self.tree.insert("", tk.END, values=values)
             
-            self.save_button.config(state=tk.NORMAL)
+            if start + batch_size < len(self.preview_rows):
+                self.root.after(1, self._insert_preview_rows, generation, start + batch_size)
             
         except Exception as e:
-            messagebox.showerror("Error", f"Error updating interface: {str(e)}")
+            messagebox.showerror("Error", f"Error updating preview: {str(e)}")
     
     def on_checkbox_change(self, column_name):
         """Handle checkbox change"""
@@ -406,14 +978,453 @@ class CSVProcessor:
         
         return self.columns
     
-    def filter_columns(self, selected_columns, output_file, show_progress=True):
+    def sample(self, n=1000, method='reservoir', random_state=None):
+        """
+        Load a sample of rows for previews
+        
+        Methods:
+            'head': first ``n`` rows
+            'reservoir': uniform random sample; reads the whole file once
+            'offset': seeks to random byte positions and resyncs to the next record.
+                Very fast on large files, but long records are slightly more likely
+                to be picked and fewer than ``n`` rows may be returned.
+            'tail': last ``n`` rows, read backwards from the end of the file
+        
+        Args:
+            n (int): Number of rows to sample
+            method (str): Sampling method ('head', 'reservoir', 'offset' or 'tail')
+            random_state (int, optional): Seed for the random methods
+        
+        Returns:
+            pandas.DataFrame: Sampled rows in file order
+        """
+        try:
+            if method not in ('head', 'reservoir', 'offset', 'tail'):
+                raise ValueError(f"Unknown sampling method: {method}")
+            
+            rng = random.Random(random_state)
+            file_size = self.input_file.stat().st_size
+            
+            with open(self.input_file, 'rb') as handle:
+                header_raw = _read_record(handle)
+                data_offset = handle.tell()
+                header_length = len(_split_record(header_raw.lstrip(codecs.BOM_UTF8)))
+                
+                def is_record(raw):
+                    # Records that do not match the header width mean we are not aligned
+                    return len(_split_record(raw)) == header_length
+                
+                if method == 'head':
+                    records = []
+                    while len(records) < n:
+                        raw = _read_record(handle)
+                        if not raw:
+                            break
+                        if raw.strip():
+                            records.append(raw)
+                
+                elif method == 'reservoir':
+                    records = []
+                    seen = 0
+                    while True:
+                        raw = _read_record(handle)
+                        if not raw:
+                            break
+                        if not raw.strip():
+                            continue
+                        if seen < n:
+                            records.append((seen, raw))
+                        else:
+                            slot = rng.randint(0, seen)
+                            if slot < n:
+                                records[slot] = (seen, raw)
+                        seen += 1
+                    records = [raw for _, raw in sorted(records)]
+                
+                elif method == 'offset':
+                    picked = {}
+                    if file_size > data_offset:
+                        offsets = sorted(rng.randrange(data_offset, file_size) for _ in range(n))
+                        for offset in offsets:
+                            # Skip the rest of the record the offset landed in
+                            handle.seek(offset - 1)
+                            handle.readline()
+                            for _ in range(10):
+                                start = handle.tell()
+                                raw = _read_record(handle)
+                                if not raw:
+                                    break
+                                if raw.strip() and is_record(raw):
+                                    picked[start] = raw
+                                    break
+                                handle.seek(start)
+                                handle.readline()
+                    records = [picked[start] for start in sorted(picked)]
+                
+                else:
+                    # Read blocks backwards until they hold enough line breaks
+                    position = file_size
+                    block = b''
+                    while position > data_offset and block.count(b'\n') <= n + 1:
+                        step = min(64 * 1024, position - data_offset)
+                        position -= step
+                        handle.seek(position)
+                        block = handle.read(step) + block
+                    
+                    handle.seek(position - 1)
+                    handle.readline()
+                    records = deque(maxlen=n)
+                    aligned = position == data_offset
+                    while True:
+                        start = handle.tell()
+                        raw = _read_record(handle)
+                        if not raw:
+                            break
+                        if not raw.strip():
+                            continue
+                        if not aligned and not is_record(raw):
+                            handle.seek(start)
+                            handle.readline()
+                            continue
+                        aligned = True
+                        records.append(raw)
+            
+            data = b''.join(raw if raw.endswith(b'\n') else raw + b'\n'
+                            for raw in [header_raw] + list(records))
+            sample_df = pd.read_csv(io.BytesIO(data))
+            self.columns = list(sample_df.columns)
+            return sample_df
+        
+        except Exception as e:
+            raise Exception(f"Error sampling CSV file: {str(e)}")
+    
+    def estimate_rows(self, sample_bytes=1024 * 1024):
+        """
+        Estimate the number of data rows from the average size of the first records
+        
+        Args:
+            sample_bytes (int): Number of bytes of records to measure
+        
+        Returns:
+            int: Estimated number of rows (exact if the file is smaller than the sample)
+        """
+        file_size = self.input_file.stat().st_size
+        with open(self.input_file, 'rb') as handle:
+            _read_record(handle)
+            data_offset = handle.tell()
+            rows = 0
+            while handle.tell() - data_offset < sample_bytes:
+                raw = _read_record(handle)
+                if not raw:
+                    return rows
+                if raw.strip():
+                    rows += 1
+            measured = handle.tell() - data_offset
+        
+        return round(rows * (file_size - data_offset) / measured)
+    
+    def _read_header(self):
+        """
+        Read the header record directly from the input file
+        
+        Duplicate or blank names are returned as pandas names them (``a.1``,
+        ``Unnamed: 0``), so streaming modes accept the same names as ``get_columns()``.
+        
+        Returns:
+            tuple: (list of column names, byte offset where data records start)
+        """
+        with open(self.input_file, 'rb') as handle:
+            raw = _read_record(handle)
+            if not raw.strip():
+                raise ValueError("CSV file has no header")
+            header = _split_record(raw.lstrip(codecs.BOM_UTF8))
+            data_offset = handle.tell()
+        
+        columns = self.get_columns()
+        if len(columns) == len(header):
+            header = columns
+        return header, data_offset
+    
+    def _iter_projected_records(self, selected_columns, start_offset, complete_only=False, by_name=False):
+        """
+        Stream records from the input file, keeping only selected columns
+        
+        Columns are returned in file order, the same as pandas ``usecols``.
+        
+        Args:
+            selected_columns (list): List of column names to keep
+            start_offset (int): Byte offset of the first record to read
+            complete_only (bool): Stop at a trailing record that is not yet terminated
+                by a newline or that ends inside a quoted field (the file may still be
+                being written)
+            by_name (bool): Return columns in the order of ``selected_columns`` and
+                fill columns missing from this file with empty values
+        
+        Yields:
+            tuple: (list of projected values, byte offset just after the record)
+        """
+        header, _ = self._read_header()
+        if by_name:
+            # Missing columns get an index past the end of any record, which yields ''
+            positions = {col: i for i, col in enumerate(header)}
+            indices = [positions.get(col, sys.maxsize) for col in selected_columns]
+        else:
+            indices = [i for i, col in enumerate(header) if col in selected_columns]
+        
+        with open(self.input_file, 'rb') as handle:
+            handle.seek(start_offset)
+            while True:
+                raw = _read_record(handle)
+                if not raw:
+                    break
+                # An odd number of quotes means the file ended inside a quoted field
+                if complete_only and (not raw.endswith(b'\n') or raw.count(b'"') % 2):
+                    break
+                if not raw.strip():
+                    continue  # Skip blank lines like pandas does
+                fields = _split_record(raw)
+                yield [fields[i] if i < len(fields) else '' for i in indices], handle.tell()
+    
+    def _filter_columns_checkpointed(self, selected_columns, output_path, checkpoint_rows, show_progress):
+        """
+        Stream selected columns to output, recording checkpoints so a crashed run can resume
+        
+        Data is written to ``<output>.part`` and renamed onto the output file only when
+        complete. Progress (input byte offset, output byte offset, row count) is stored
+        in ``<output>.checkpoint`` every ``checkpoint_rows`` rows.
+        
+        Args:
+            selected_columns (list): List of column names to keep
+            output_path (Path): Path for output file
+            checkpoint_rows (int): Number of rows between checkpoints
+            show_progress (bool): Whether to show progress information
+        
+        Returns:
+            int: Number of data rows written
+        """
+        if checkpoint_rows < 1:
+            raise ValueError("checkpoint_rows must be at least 1")
+        
+        part_path = output_path.with_name(output_path.name + '.part')
+        state_path = output_path.with_name(output_path.name + '.checkpoint')
+        
+        header, data_offset = self._read_header()
+        output_columns = [col for col in header if col in selected_columns]
+        input_stat = self.input_file.stat()
+        base_state = {
+            'input_file': str(self.input_file.resolve()),
+            'input_size': input_stat.st_size,
+            'input_mtime_ns': input_stat.st_mtime_ns,
+            'columns': output_columns
+        }
+        
+        # Resume only if the checkpoint matches this exact job and the partial output survived
+        state = None
+        if state_path.exists() and part_path.exists():
+            try:
+                with open(state_path, 'r', encoding='utf-8') as handle:
+                    state = json.load(handle)
+            except (OSError, ValueError):
+                state = None
+            if state is not None:
+                if any(state.get(key) != value for key, value in base_state.items()):
+                    state = None
+                elif part_path.stat().st_size < state['output_offset']:
+                    state = None
+        
+        if state is not None:
+            output_handle = open(part_path, 'r+b')
+            output_handle.truncate(state['output_offset'])
+            output_handle.seek(state['output_offset'])
+            if show_progress:
+                print(f"Resuming from checkpoint: {state['rows']:,} rows already written")
+        else:
+            output_handle = open(part_path, 'wb')
+            buffer = io.StringIO()
+            csv.writer(buffer, lineterminator='\n').writerow(output_columns)
+            output_handle.write(buffer.getvalue().encode('utf-8'))
+            state = dict(base_state, input_offset=data_offset, output_offset=output_handle.tell(), rows=0)
+        
+        def save_checkpoint(input_offset, rows):
+            output_handle.flush()
+            os.fsync(output_handle.fileno())
+            state.update(input_offset=input_offset, output_offset=output_handle.tell(), rows=rows)
+            _write_json_atomic(state_path, state)
+        
+        try:
+            rows = state['rows']
+            input_offset = state['input_offset']
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, lineterminator='\n')
+            
+            for values, input_offset in self._iter_projected_records(selected_columns, input_offset):
+                writer.writerow(values)
+                rows += 1
+                if rows % checkpoint_rows == 0:
+                    output_handle.write(buffer.getvalue().encode('utf-8'))
+                    buffer.seek(0)
+                    buffer.truncate()
+                    save_checkpoint(input_offset, rows)
+                    if show_progress:
+                        print(f"Checkpoint: {rows:,} rows written")
+            
+            output_handle.write(buffer.getvalue().encode('utf-8'))
+            save_checkpoint(input_offset, rows)
+        finally:
+            output_handle.close()
+        
+        os.replace(part_path, output_path)
+        state_path.unlink()
+        return rows
+    
+    def _input_fingerprint(self, header_end, offset):
+        """
+        Fingerprint the input file so later runs can detect truncation, rotation or header changes
+        
+        Args:
+            header_end (int): Byte offset where the header record ends
+            offset (int): Byte offset up to which the file has been processed
+        
+        Returns:
+            dict: Header hash, file identity and a hash of the bytes just before ``offset``
+        """
+        input_stat = self.input_file.stat()
+        with open(self.input_file, 'rb') as handle:
+            header_hash = hashlib.sha256(handle.read(header_end)).hexdigest()
+            tail_start = max(header_end, offset - 4096)
+            handle.seek(tail_start)
+            tail_hash = hashlib.sha256(handle.read(offset - tail_start)).hexdigest()
+        
+        return {
+            'header_hash': header_hash,
+            'device': input_stat.st_dev,
+            'inode': input_stat.st_ino,
+            'tail_hash': tail_hash
+        }
+    
+    def _filter_columns_incremental(self, selected_columns, output_path, show_progress):
+        """
+        Append records added to the input since the previous run to the existing output
+        
+        The processed byte offset and input fingerprint are stored in ``<output>.incremental``.
+        The output is rebuilt from scratch if the input was truncated, rotated or its header
+        changed, if the selected columns differ, or if the output file is missing.
+        
+        Args:
+            selected_columns (list): List of column names to keep
+            output_path (Path): Path for output file
+            show_progress (bool): Whether to show progress information
+        
+        Returns:
+            tuple: (total rows in output, rows added by this run, whether output was rebuilt)
+        """
+        state_path = output_path.with_name(output_path.name + '.incremental')
+        header, data_offset = self._read_header()
+        output_columns = [col for col in header if col in selected_columns]
+        input_size = self.input_file.stat().st_size
+        
+        state = None
+        if state_path.exists() and output_path.exists():
+            try:
+                with open(state_path, 'r', encoding='utf-8') as handle:
+                    state = json.load(handle)
+            except (OSError, ValueError):
+                state = None
+        
+        reason = None
+        if state is None:
+            reason = "no previous state"
+        elif state.get('input_file') != str(self.input_file.resolve()) or state.get('columns') != output_columns:
+            reason = "input file or selected columns changed"
+        elif input_size < state['input_offset']:
+            reason = "input file was truncated"
+        elif self._input_fingerprint(data_offset, state['input_offset']) != state['fingerprint']:
+            reason = "input file was rotated or its header changed"
+        elif output_path.stat().st_size < state['output_offset']:
+            reason = "output file is shorter than recorded"
+        
+        if reason is not None:
+            if show_progress:
+                print(f"Full rebuild: {reason}")
+            part_path = output_path.with_name(output_path.name + '.part')
+            output_handle = open(part_path, 'wb')
+            buffer = io.StringIO()
+            csv.writer(buffer, lineterminator='\n').writerow(output_columns)
+            output_handle.write(buffer.getvalue().encode('utf-8'))
+            input_offset = data_offset
+            previous_rows = 0
+        else:
+            part_path = None
+            output_handle = open(output_path, 'r+b')
+            # Drop anything written after the last recorded state (e.g. an interrupted run)
+            output_handle.truncate(state['output_offset'])
+            output_handle.seek(state['output_offset'])
+            input_offset = state['input_offset']
+            previous_rows = state['rows']
+            if show_progress:
+                print(f"Incremental update from byte {input_offset:,} ({previous_rows:,} rows already extracted)")
+        
+        try:
+            new_rows = 0
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, lineterminator='\n')
+            for values, input_offset in self._iter_projected_records(
+                    selected_columns, input_offset, complete_only=True):
+                writer.writerow(values)
+                new_rows += 1
+                if buffer.tell() >= 1024 * 1024:
+                    output_handle.write(buffer.getvalue().encode('utf-8'))
+                    buffer.seek(0)
+                    buffer.truncate()
+            output_handle.write(buffer.getvalue().encode('utf-8'))
+            output_handle.flush()
+            os.fsync(output_handle.fileno())
+            output_offset = output_handle.tell()
+        finally:
+            output_handle.close()
+        
+        if part_path is not None:
+            os.replace(part_path, output_path)
+        
+        _write_json_atomic(state_path, {
+            'input_file': str(self.input_file.resolve()),
+            'columns': output_columns,
+            'input_offset': input_offset,
+            'output_offset': output_offset,
+            'rows': previous_rows + new_rows,
+            'fingerprint': self._input_fingerprint(data_offset, input_offset)
+        })
+        return previous_rows + new_rows, new_rows, part_path is not None
+    
+    def filter_columns(self, selected_columns, output_file, show_progress=True,
+                       checkpoint=False, checkpoint_rows=100000, incremental=False,
+                       distinct=False, count=False, memory_mb=512,
+                       sort_by=None, descending=False, workers=1):
         """
         Filter CSV to include only selected columns
         
+        The checkpoint, incremental, distinct and sort modes stream the file and copy
+        values byte-for-byte, while the default mode re-formats them through pandas
+        (e.g. ``1.50`` stays ``1.50`` instead of becoming ``1.5``, and an integer column
+        with empty values is not written as ``12.0``).
+        
         Args:
             selected_columns (list): List of column names to keep
             output_file (str): Path for output file
             show_progress (bool): Whether to show progress information
+            checkpoint (bool): Stream the file with periodic checkpoints, writing to a
+                temporary file and resuming from the last checkpoint after a crash
+            checkpoint_rows (int): Number of rows between checkpoints
+            incremental (bool): Process only records appended since the previous incremental
+                run and append them to the existing output
+            distinct (bool): Stream the file and drop duplicate rows of the selected columns
+            count (bool): With ``distinct``, add a ``count`` column with the number of occurrences
+            memory_mb (int): Memory budget for distinct and sort modes before spilling to disk
+            sort_by (list, optional): Column names to sort the output by, using an external
+                merge sort. Numbers sort numerically, text alphabetically, empty values last.
+            descending (bool): With ``sort_by``, sort in descending order (text, then
+                numbers, each in descending order; empty values still last)
+            workers (int): With ``sort_by``, number of worker processes sorting runs
         
         Returns:
             dict: Information about the operation (input/output sizes, row/column counts)
@@ -431,6 +1442,26 @@ class CSVProcessor:
             if not selected_columns:
                 raise ValueError("No columns selected")
             
+            if sum([checkpoint, incremental, distinct]) > 1:
+                raise ValueError("Checkpoint, incremental and distinct modes cannot be combined")
+            
+            if count and not distinct:
+                raise ValueError("Counting occurrences requires distinct mode")
+            
+            if count and 'count' in selected_columns:
+                raise ValueError("Column 'count' conflicts with the occurrence count column")
+            
+            if isinstance(sort_by, str):
+                sort_by = [sort_by]
+            
+            if sort_by:
+                if checkpoint or incremental:
+                    raise ValueError("Sorting cannot be combined with checkpoint or incremental modes")
+                sortable_columns = selected_columns + ['count'] if count else selected_columns
+                invalid_sort_columns = [col for col in sort_by if col not in sortable_columns]
+                if invalid_sort_columns:
+                    raise ValueError(f"Sort columns must be selected: {invalid_sort_columns}")
+            
             # Get input file size
             input_size = self.input_file.stat().st_size
             input_size_mb = input_size / (1024 * 1024)
@@ -440,11 +1471,36 @@ class CSVProcessor:
                 print(f"Input file size: {input_size_mb:.2f} MB")
                 print(f"Selected columns: {', '.join(selected_columns)}")
             
-            # Load data with selected columns only
-            df_filtered = pd.read_csv(self.input_file, usecols=selected_columns)
-            
-            # Save to output file
-            df_filtered.to_csv(output_path, index=False)
+            if incremental:
+                rows, new_rows, rebuilt = self._filter_columns_incremental(
+                    selected_columns, output_path, show_progress)
+            elif checkpoint:
+                rows = self._filter_columns_checkpointed(
+                    selected_columns, output_path, checkpoint_rows, show_progress)
+            elif distinct or sort_by:
+                header, data_offset = self._read_header()
+                output_columns = [col for col in header if col in selected_columns]
+                if count:
+                    output_columns = output_columns + ['count']
+                
+                records = (values for values, _ in self._iter_projected_records(selected_columns, data_offset))
+                if distinct:
+                    distinct_stats = {}
+                    records = _distinct_rows(records, count=count, memory_mb=memory_mb,
+                                             temp_dir=output_path.parent, stats=distinct_stats)
+                if sort_by:
+                    sort_stats = {}
+                    records = _sorted_rows(records, [output_columns.index(col) for col in sort_by],
+                                           descending=descending, memory_mb=memory_mb,
+                                           temp_dir=output_path.parent, workers=workers, stats=sort_stats)
+                rows = _write_rows(output_path, output_columns, records)
+            else:
+                # Load data with selected columns only
+                df_filtered = pd.read_csv(self.input_file, usecols=selected_columns)
+                
+                # Save to output file
+                df_filtered.to_csv(output_path, index=False)
+                rows = len(df_filtered)
             
             # Get output file size
             output_size = output_path.stat().st_size
@@ -458,13 +1514,28 @@ class CSVProcessor:
                 'total_columns': len(available_columns),
                 'selected_columns': len(selected_columns),
                 'selected_column_names': selected_columns,
-                'rows': len(df_filtered)
+                'rows': rows
             }
+            if incremental:
+                result_info['new_rows'] = new_rows
+                result_info['full_rebuild'] = rebuilt
+            if distinct:
+                result_info['input_rows'] = distinct_stats['input_rows']
+                result_info['spilled_to_disk'] = distinct_stats['spilled']
+            if sort_by:
+                result_info['sort_by'] = sort_by
+                result_info['sort_runs'] = sort_stats['runs']
             
             if show_progress:
                 print(f"Output file: {output_path.name}")
                 print(f"Output file size: {output_size_mb:.2f} MB")
-                print(f"Rows processed: {len(df_filtered):,}")
+                print(f"Rows processed: {rows:,}")
+                if incremental:
+                    print(f"New rows appended: {new_rows:,}")
+                if distinct:
+                    print(f"Distinct rows: {rows:,} of {distinct_stats['input_rows']:,}")
+                if sort_by:
+                    print(f"Sorted by: {', '.join(sort_by)} ({sort_stats['runs']} runs on disk)")
                 print(f"Columns: {len(selected_columns)} of {len(available_columns)}")
                 print("Operation completed successfully!")
             
@@ -472,6 +1543,456 @@ class CSVProcessor:
             
         except Exception as e:
             raise Exception(f"Error filtering CSV: {str(e)}")
+    
+    def aggregate(self, group_by, aggregations=None, output_file=None, show_progress=True,
+                  chunk_mb=64, workers=1):
+        """
+        Group rows by key columns and aggregate value columns, reading the file chunk by chunk
+        
+        Partial aggregates of each chunk are combined as the file is read, so memory
+        is bounded by the number of groups rather than the number of rows.
+        
+        Args:
+            group_by (list): Column names to group by (``count`` is reserved for the
+                row count column)
+            aggregations (dict, optional): Value column name -> list of functions
+                ('count', 'sum', 'mean', 'min', 'max'), e.g. ``{'age': ['mean', 'max']}``.
+                Non-numeric values are ignored.
+            output_file (str, optional): Path for output CSV file
+            show_progress (bool): Whether to show progress information
+            chunk_mb (int): Size of the chunks read from the input file
+            workers (int): Number of worker processes aggregating chunks
+        
+        Returns:
+            pandas.DataFrame: One row per group with a ``count`` column (rows per group)
+                and a ``<column>_<function>`` column per aggregation, sorted by group keys
+        """
+        try:
+            if isinstance(group_by, str):
+                group_by = [group_by]
+            aggregations = {col: [funcs] if isinstance(funcs, str) else list(funcs)
+                            for col, funcs in (aggregations or {}).items()}
+            
+            # Validate columns and functions
+            available_columns = self.get_columns()
+            invalid_columns = [col for col in list(group_by) + list(aggregations)
+                               if col not in available_columns]
+            
+            if invalid_columns:
+                raise ValueError(f"Invalid column names: {invalid_columns}")
+            
+            if not group_by:
+                raise ValueError("No group by columns selected")
+            
+            if 'count' in group_by:
+                raise ValueError("Column 'count' conflicts with the group row count column")
+            
+            grouped_values = [col for col in aggregations if col in group_by]
+            if grouped_values:
+                raise ValueError(f"Cannot aggregate group by columns: {grouped_values}")
+            
+            invalid_functions = [func for funcs in aggregations.values() for func in funcs
+                                 if func not in AGGREGATE_FUNCTIONS]
+            if invalid_functions:
+                raise ValueError(f"Invalid aggregate functions: {invalid_functions}")
+            
+            value_columns = list(aggregations)
+            
+            if show_progress:
+                print(f"Aggregating file: {self.input_file.name}")
+                print(f"Group by: {', '.join(group_by)}")
+            
+            def add_partial(combined, partial):
+                if combined is None:
+                    return partial
+                return _combine_partials([combined, partial], value_columns)
+            
+            with open(self.input_file, 'rb') as handle:
+                header_raw = _read_record(handle)
+                blocks = _iter_record_blocks(handle, int(chunk_mb * 1024 * 1024))
+                
+                combined = None
+                if workers > 1:
+                    with ProcessPoolExecutor(max_workers=workers) as executor:
+                        pending = []
+                        for block in blocks:
+                            pending.append(executor.submit(
+                                _aggregate_block, header_raw, block, group_by, value_columns))
+                            # Bound the number of chunks held in memory
+                            if len(pending) >= workers * 2:
+                                combined = add_partial(combined, pending.pop(0).result())
+                        for future in pending:
+                            combined = add_partial(combined, future.result())
+                else:
+                    for block in blocks:
+                        combined = add_partial(
+                            combined, _aggregate_block(header_raw, block, group_by, value_columns))
+            
+            if combined is None:
+                # No data rows: aggregate the header alone to get an empty result
+                combined = _aggregate_block(header_raw, b'', group_by, value_columns)
+            
+            # Turn partial aggregates into the requested results
+            result = combined[['count']].copy()
+            for col, funcs in aggregations.items():
+                for func in funcs:
+                    if func == 'mean':
+                        result[f'{col}_mean'] = combined[f'{col}__sum'] / combined[f'{col}__count']
+                    else:
+                        result[f'{col}_{func}'] = combined[f'{col}__{func}']
+            
+            result = result.sort_index().reset_index()
+            result.columns = list(group_by) + list(result.columns[len(group_by):])
+            
+            if output_file:
+                result.to_csv(output_file, index=False)
+            
+            if show_progress:
+                print(f"Groups: {len(result):,}")
+                print(f"Rows aggregated: {int(result['count'].sum()):,}")
+                if output_file:
+                    print(f"Output file: {Path(output_file).name}")
+                print("Operation completed successfully!")
+            
+            return result
+            
+        except Exception as e:
+            raise Exception(f"Error aggregating CSV: {str(e)}")
+    
+    def split_columns(self, selected_columns, output_dir, shard_mb=None, partition_by=None,
+                      partitions=None, max_open_files=64, show_progress=True):
+        """
+        Write selected columns into several shard files in one streaming pass
+        
+        Modes:
+            ``shard_mb``: consecutive shards of at most ``shard_mb`` MB each
+            ``partition_by`` and ``partitions``: rows hashed by the column value into
+                ``partitions`` files
+            ``partition_by`` alone: one file per distinct column value
+        
+        Each shard has its own header. A ``manifest.json`` listing shard paths, row
+        counts and byte sizes is written to ``output_dir`` when all shards are complete.
+        Shards listed in a ``manifest.json`` left by an earlier run are deleted first.
+        
+        Args:
+            selected_columns (list): List of column names to keep
+            output_dir (str): Directory for shard files (created if missing)
+            shard_mb (float, optional): Maximum shard size in MB
+            partition_by (str, optional): Column name to partition rows by
+            partitions (int, optional): Number of hash partitions
+            max_open_files (int): Maximum number of shard files open at the same time
+            show_progress (bool): Whether to show progress information
+        
+        Returns:
+            dict: Information about the operation, including the list of ``shards``
+        """
+        try:
+            output_path = Path(output_dir)
+            
+            # Validate selected columns and mode
+            available_columns = self.get_columns()
+            invalid_columns = [col for col in selected_columns if col not in available_columns]
+            
+            if invalid_columns:
+                raise ValueError(f"Invalid column names: {invalid_columns}")
+            
+            if not selected_columns:
+                raise ValueError("No columns selected")
+            
+            if (shard_mb is None) == (partition_by is None):
+                raise ValueError("Specify either shard_mb or partition_by")
+            
+            if partition_by is not None and partition_by not in selected_columns:
+                raise ValueError(f"Partition column must be selected: {partition_by}")
+            
+            if shard_mb is not None and shard_mb <= 0:
+                raise ValueError("shard_mb must be positive")
+            
+            if partitions is not None and partitions < 1:
+                raise ValueError("partitions must be at least 1")
+            
+            if shard_mb is not None:
+                mode = 'size'
+            elif partitions is not None:
+                mode = 'hash'
+            else:
+                mode = 'value'
+            
+            input_size_mb = self.input_file.stat().st_size / (1024 * 1024)
+            
+            if show_progress:
+                print(f"Processing file: {self.input_file.name}")
+                print(f"Input file size: {input_size_mb:.2f} MB")
+                print(f"Selected columns: {', '.join(selected_columns)}")
+            
+            header, data_offset = self._read_header()
+            output_columns = [col for col in header if col in selected_columns]
+            output_path.mkdir(parents=True, exist_ok=True)
+            
+            # Remove shards of an earlier run so they cannot mix with the new ones
+            manifest_path = output_path / 'manifest.json'
+            if manifest_path.exists():
+                with open(manifest_path, 'r', encoding='utf-8') as handle:
+                    old_manifest = json.load(handle)
+                for shard in old_manifest.get('shards', []):
+                    (output_path / Path(shard['path']).name).unlink(missing_ok=True)
+                manifest_path.unlink()
+            
+            shard_writer = _ShardWriter(output_path, output_columns, max_open_files)
+            shard_names = {}  # partition value -> shard file name (value mode)
+            taken_names = set()  # lowercased value parts of shard file names
+            try:
+                if mode == 'size':
+                    shard_limit = shard_mb * 1024 * 1024
+                    shard_name = 'part_00000.csv'
+                    for values, _ in self._iter_projected_records(selected_columns, data_offset):
+                        data = shard_writer.encode(values)
+                        shard = shard_writer.shards.get(shard_name)
+                        if shard is not None and shard['rows'] and shard['bytes'] + len(data) > shard_limit:
+                            shard_name = f'part_{len(shard_writer.shards):05d}.csv'
+                        shard_writer.write(shard_name, data)
+                else:
+                    key_index = output_columns.index(partition_by)
+                    for values, _ in self._iter_projected_records(selected_columns, data_offset):
+                        value = values[key_index]
+                        if mode == 'hash':
+                            # Hashed per row so memory does not grow with the number of keys
+                            shard_name = f'part_{zlib.crc32(value.encode("utf-8")) % partitions:05d}.csv'
+                        else:
+                            shard_name = shard_names.get(value)
+                            if shard_name is None:
+                                # Keep file names safe and unique for any value, also on
+                                # case-insensitive filesystems (e.g. "Paris" and "paris")
+                                safe_value = re.sub(r'[^\w.-]', '_', value)[:100]
+                                if safe_value != value or not value or safe_value.lower() in taken_names:
+                                    safe_value += '_' + hashlib.md5(value.encode('utf-8')).hexdigest()[:8]
+                                taken_names.add(safe_value.lower())
+                                shard_name = f'{partition_by}={safe_value}.csv'
+                                shard_names[value] = shard_name
+                        shard_writer.write(shard_name, shard_writer.encode(values))
+            finally:
+                shard_writer.close()
+            
+            shards = list(shard_writer.shards.values())
+            if mode == 'value':
+                for value, shard_name in shard_names.items():
+                    shard_writer.shards[shard_name]['partition_value'] = value
+            elif mode == 'hash':
+                for shard in shards:
+                    shard['partition'] = int(shard['path'][len('part_'):-len('.csv')])
+                shards.sort(key=lambda shard: shard['partition'])
+            
+            rows = sum(shard['rows'] for shard in shards)
+            manifest = {
+                'input_file': str(self.input_file),
+                'columns': output_columns,
+                'mode': mode,
+                'partition_by': partition_by,
+                'rows': rows,
+                'shards': shards
+            }
+            _write_json_atomic(manifest_path, manifest)
+            
+            result_info = {
+                'input_file': str(self.input_file),
+                'output_dir': str(output_path),
+                'manifest_file': str(manifest_path),
+                'input_size_mb': input_size_mb,
+                'output_size_mb': sum(shard['bytes'] for shard in shards) / (1024 * 1024),
+                'total_columns': len(available_columns),
+                'selected_columns': len(selected_columns),
+                'selected_column_names': selected_columns,
+                'rows': rows,
+                'shards': shards
+            }
+            
+            if show_progress:
+                print(f"Output directory: {output_path}")
+                print(f"Shards written: {len(shards):,}")
+                print(f"Rows processed: {rows:,}")
+                print(f"Columns: {len(selected_columns)} of {len(available_columns)}")
+                print("Operation completed successfully!")
+            
+            return result_info
+            
+        except Exception as e:
+            raise Exception(f"Error splitting CSV: {str(e)}")
+
+
+def _extract_file_rows(input_file, selected_columns, output_file, append=False):
+    """
+    Write selected columns of one input file, matched by name, as headerless CSV rows
+    
+    Module-level so it can run in a worker process.
+    
+    Returns:
+        int: Number of rows written
+    """
+    processor = CSVProcessor(input_file)
+    _, data_offset = processor._read_header()
+    rows = 0
+    with open(output_file, 'a' if append else 'w', newline='', encoding='utf-8') as handle:
+        writer = csv.writer(handle, lineterminator='\n')
+        for values, _ in processor._iter_projected_records(selected_columns, data_offset, by_name=True):
+            writer.writerow(values)
+            rows += 1
+    return rows
+
+
+class MultiCSVProcessor:
+    """
+    Class for extracting the same columns from several CSV files into one output
+    
+    File headers may differ: columns are matched by name in each file and columns
+    missing from a file are filled with empty values.
+    """
+    
+    def __init__(self, input_files):
+        """
+        Initialize multi-file processor
+        
+        Args:
+            input_files (str or list): Glob pattern, file path, or list of them.
+                Files are processed in the given order; glob matches are sorted by name.
+                A path naming an existing file is used as is, even if it looks like a glob.
+        """
+        if isinstance(input_files, (str, Path)):
+            input_files = [input_files]
+        
+        self.input_files = []
+        for pattern in input_files:
+            # Existing files are taken literally, even if their names contain [, * or ?
+            if Path(pattern).is_file():
+                self.input_files.append(Path(pattern))
+                continue
+            matches = sorted(glob.glob(str(pattern)))
+            if not matches:
+                raise FileNotFoundError(f"Input file not found: {pattern}")
+            self.input_files.extend(Path(match) for match in matches)
+        
+        self.processors = [CSVProcessor(input_file) for input_file in self.input_files]
+        self.columns = None
+    
+    def get_columns(self):
+        """
+        Get the union of columns of all input files
+        
+        Returns:
+            list: Column names in order of first appearance
+        """
+        if self.columns is None:
+            self.columns = []
+            for processor in self.processors:
+                header, _ = processor._read_header()
+                self.columns.extend(col for col in header if col not in self.columns)
+        
+        return self.columns
+    
+    def filter_columns(self, selected_columns, output_file, show_progress=True, workers=1):
+        """
+        Extract selected columns from all input files into a single output file
+        
+        Args:
+            selected_columns (list): List of column names to keep, in output order
+            output_file (str): Path for output file
+            show_progress (bool): Whether to show progress information
+            workers (int): Number of files read in parallel by worker processes.
+                Output order always follows the input file order.
+                If the output file is one of the inputs (e.g. a glob matching the
+                output of an earlier run), it is skipped.
+        
+        Returns:
+            dict: Information about the operation, including per-file row counts
+        """
+        try:
+            output_path = Path(output_file)
+            
+            # Never read the output file as an input, it is truncated before reading
+            output_resolved = output_path.resolve()
+            if any(path.resolve() == output_resolved for path in self.input_files):
+                self.processors = [processor for processor in self.processors
+                                   if processor.input_file.resolve() != output_resolved]
+                self.input_files = [processor.input_file for processor in self.processors]
+                self.columns = None
+                if not self.input_files:
+                    raise ValueError("Output file is the only input file")
+            
+            # Validate selected columns
+            available_columns = self.get_columns()
+            invalid_columns = [col for col in selected_columns if col not in available_columns]
+            
+            if invalid_columns:
+                raise ValueError(f"Invalid column names: {invalid_columns}")
+            
+            if not selected_columns:
+                raise ValueError("No columns selected")
+            
+            input_size_mb = sum(path.stat().st_size for path in self.input_files) / (1024 * 1024)
+            
+            if show_progress:
+                print(f"Processing {len(self.input_files)} files")
+                print(f"Input files size: {input_size_mb:.2f} MB")
+                print(f"Selected columns: {', '.join(selected_columns)}")
+            
+            file_results = []
+            for processor in self.processors:
+                header, _ = processor._read_header()
+                file_results.append({
+                    'input_file': str(processor.input_file),
+                    'missing_columns': [col for col in selected_columns if col not in header]
+                })
+            
+            _write_rows(output_path, selected_columns, [])
+            
+            if workers > 1:
+                with tempfile.TemporaryDirectory(prefix='csv_multi_', dir=output_path.parent) as part_dir, \
+                        ProcessPoolExecutor(max_workers=workers) as executor:
+                    part_paths = [Path(part_dir) / f'part_{i}.csv' for i in range(len(self.input_files))]
+                    futures = [executor.submit(_extract_file_rows, input_file, selected_columns, part_path)
+                               for input_file, part_path in zip(self.input_files, part_paths)]
+                    
+                    # Append each part as soon as it and all earlier parts are done
+                    with open(output_path, 'ab') as output_handle:
+                        for file_result, future, part_path in zip(file_results, futures, part_paths):
+                            file_result['rows'] = future.result()
+                            with open(part_path, 'rb') as part_handle:
+                                shutil.copyfileobj(part_handle, output_handle, 1024 * 1024)
+                            part_path.unlink()
+                            if show_progress:
+                                print(f"  {Path(file_result['input_file']).name}: {file_result['rows']:,} rows")
+            else:
+                for file_result in file_results:
+                    file_result['rows'] = _extract_file_rows(
+                        file_result['input_file'], selected_columns, output_path, append=True)
+                    if show_progress:
+                        print(f"  {Path(file_result['input_file']).name}: {file_result['rows']:,} rows")
+            
+            rows = sum(file_result['rows'] for file_result in file_results)
+            output_size_mb = output_path.stat().st_size / (1024 * 1024)
+            
+            result_info = {
+                'input_files': [str(path) for path in self.input_files],
+                'output_file': str(output_path),
+                'input_size_mb': input_size_mb,
+                'output_size_mb': output_size_mb,
+                'total_columns': len(available_columns),
+                'selected_columns': len(selected_columns),
+                'selected_column_names': selected_columns,
+                'rows': rows,
+                'files': file_results
+            }
+            
+            if show_progress:
+                print(f"Output file: {output_path.name}")
+                print(f"Output file size: {output_size_mb:.2f} MB")
+                print(f"Rows processed: {rows:,}")
+                print(f"Columns: {len(selected_columns)} of {len(available_columns)}")
+                print("Operation completed successfully!")
+            
+            return result_info
+            
+        except Exception as e:
+            raise Exception(f"Error filtering CSV files: {str(e)}")
 
 
 def command_line_interface():
@@ -489,11 +2010,33 @@ Examples:
   
   # Filter with custom columns
   python data_collection_csv.py -i employees.csv -c "first_name,last_name,salary" -o payroll.csv
+  
+  # Long-running job that can be resumed after a crash (re-run the same command)
+  python data_collection_csv.py -i big.csv -c name,age -o filtered.csv --checkpoint
+  
+  # Hourly refresh of a growing log file, processing only newly appended records
+  python data_collection_csv.py -i events.csv -c time,user -o events_small.csv --incremental
+  
+  # Distinct (city, profession) pairs with the number of occurrences
+  python data_collection_csv.py -i data.csv -c city,profession -o pairs.csv --distinct --count
+  
+  # Sort extracted columns by surname, even when the file is larger than memory
+  python data_collection_csv.py -i data.csv -c name,surname,number -o sorted.csv --sort-by surname
+  
+  # Count rows and mean age per profession, reading the file chunk by chunk
+  python data_collection_csv.py -i data.csv --group-by profession --agg age:mean -o by_profession.csv
+  
+  # Write one file per city, or 1 GB shards, with a manifest.json in the output directory
+  python data_collection_csv.py -i data.csv -c name,city -o by_city --partition-by city
+  python data_collection_csv.py -i data.csv -c name,city -o shards --shard-mb 1024
+  
+  # Combine daily partitions whose headers differ, reading 4 files in parallel
+  python data_collection_csv.py -i "daily/*.csv" -c id,name,value -o combined.csv --workers 4
         """
     )
     
-    parser.add_argument('-i', '--input', required=True, 
-                       help='Input CSV file path')
+    parser.add_argument('-i', '--input', required=True, nargs='+',
+                       help='Input CSV file path (several paths or a glob pattern combine the files)')
     parser.add_argument('-c', '--columns', 
                        help='Comma-separated list of column names to keep (e.g., "name,age,city")')
     parser.add_argument('-o', '--output', 
@@ -502,17 +2045,54 @@ Examples:
                        help='Show available columns in the input file and exit')
     parser.add_argument('--gui', action='store_true',
                        help='Launch graphical user interface')
+    parser.add_argument('--checkpoint', action='store_true',
+                       help='Stream with periodic checkpoints and resume an interrupted run')
+    parser.add_argument('--checkpoint-rows', type=int, default=100000,
+                       help='Number of rows between checkpoints (default: 100000)')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Append only records added to the input since the previous incremental run')
+    parser.add_argument('--distinct', action='store_true',
+                       help='Remove duplicate rows of the selected columns')
+    parser.add_argument('--count', action='store_true',
+                       help='With --distinct, add a "count" column with the number of occurrences')
+    parser.add_argument('--memory-mb', type=int, default=512,
+                       help='Memory budget in MB before spilling to disk (default: 512)')
+    parser.add_argument('--sort-by',
+                       help='Comma-separated list of selected columns to sort the output by')
+    parser.add_argument('--descending', action='store_true',
+                       help='With --sort-by, sort in descending order')
+    parser.add_argument('--shard-mb', type=float,
+                       help='Split the output into shards of at most this many MB (--output is a directory)')
+    parser.add_argument('--partition-by',
+                       help='Split the output into one file per value of this column (--output is a directory)')
+    parser.add_argument('--partitions', type=int,
+                       help='With --partition-by, hash values into this many files instead')
+    parser.add_argument('--max-open-files', type=int, default=64,
+                       help='Maximum number of shard files open at the same time (default: 64)')
+    parser.add_argument('--group-by',
+                       help='Comma-separated list of columns to group by (aggregation mode)')
+    parser.add_argument('--agg',
+                       help='Comma-separated aggregations as column:function, where function is '
+                            'count, sum, mean, min or max (e.g., "age:mean,age:max")')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Number of worker processes for reading multiple files, sorting '
+                            'or aggregating (default: 1)')
     
     args = parser.parse_args()
     
     try:
         # Initialize processor
-        processor = CSVProcessor(args.input)
+        multi_input = len(args.input) > 1 or (
+            glob.has_magic(args.input[0]) and not Path(args.input[0]).is_file())
+        if multi_input:
+            processor = MultiCSVProcessor(args.input)
+        else:
+            processor = CSVProcessor(args.input[0])
         
         # Show columns if requested
         if args.show_columns:
             columns = processor.get_columns()
-            print(f"\nAvailable columns in '{args.input}':")
+            print(f"\nAvailable columns in '{', '.join(args.input)}':")
             print("-" * 50)
             for i, col in enumerate(columns, 1):
                 print(f"{i:3d}. {col}")
@@ -525,6 +2105,24 @@ Examples:
             app.run()
             return
         
+        # Aggregate if requested
+        if args.group_by:
+            if multi_input:
+                raise ValueError("--group-by requires a single input file")
+            aggregations = {}
+            for item in (args.agg.split(',') if args.agg else []):
+                col, _, func = item.strip().rpartition(':')
+                if not col:
+                    raise ValueError(f"Invalid aggregation '{item}', expected column:function")
+                aggregations.setdefault(col, []).append(func)
+            
+            group_by = [col.strip() for col in args.group_by.split(',')]
+            result = processor.aggregate(group_by, aggregations, output_file=args.output,
+                                         workers=args.workers)
+            if not args.output:
+                print(result.to_string(index=False))
+            return
+        
         # Check if columns and output are provided for filtering
         if not args.columns or not args.output:
             print("Error: Both --columns and --output are required for filtering.")
@@ -535,9 +2133,36 @@ Examples:
         
         # Parse column names
         selected_columns = [col.strip() for col in args.columns.split(',')]
+        sort_by = [col.strip() for col in args.sort_by.split(',')] if args.sort_by else None
+        
+        # Split into shards if requested
+        if args.shard_mb is not None or args.partition_by:
+            if multi_input:
+                raise ValueError("--shard-mb and --partition-by require a single input file")
+            result = processor.split_columns(selected_columns, args.output,
+                                             shard_mb=args.shard_mb,
+                                             partition_by=args.partition_by,
+                                             partitions=args.partitions,
+                                             max_open_files=args.max_open_files)
+            return
         
         # Filter CSV
-        result = processor.filter_columns(selected_columns, args.output)
+        if multi_input:
+            if args.checkpoint or args.incremental or args.distinct or args.sort_by:
+                raise ValueError("--checkpoint, --incremental, --distinct and --sort-by require a single input file")
+            result = processor.filter_columns(selected_columns, args.output, workers=args.workers)
+            return
+        
+        result = processor.filter_columns(selected_columns, args.output,
+                                          checkpoint=args.checkpoint,
+                                          checkpoint_rows=args.checkpoint_rows,
+                                          incremental=args.incremental,
+                                          distinct=args.distinct,
+                                          count=args.count,
+                                          memory_mb=args.memory_mb,
+                                          sort_by=sort_by,
+                                          descending=args.descending,
+                                          workers=args.workers)
         
     except FileNotFoundError as e:
         print(f"Error: {e}")